@@ -1,54 +1,94 @@
 import sys
 import subprocess
 import os
-import platform
+import argparse
 
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+REPORT_PATH = "logs/public_report.json"
 
-def run_command(command, description):
+
+def run_command(command, description, env=None):
     print("")
     print(f"[{description}]")
     print(f"Running: {' '.join(command)}")
     try:
         # 'shell=True' should only be used on Windows for internal commands like 'dir' or 'echo' if needed
         # 'shell=False' is safer and cross-platform compatible for python scripts
-        subprocess.check_call(command, shell=False)
+        subprocess.check_call(command, shell=False, env=env)
         print("✅ PASS")
     except subprocess.CalledProcessError:
         print("❌ FAIL")
         sys.exit(1)
 
 
-def main():
-    print("==========================================")
-    print("   SECURE RAG - REPRODUCIBILITY SUITE")
-    print("==========================================")
+def run_function(func, description, *args):
+    print("")
+    print(f"[{description}]")
+    print(f"Running: {func.__module__}.{func.__name__}")
+    try:
+        func(*args)
+    except SystemExit as e:
+        # A script bailing out with sys.exit(0) still counts as a pass
+        if e.code not in (None, 0):
+            print("❌ FAIL")
+            sys.exit(1)
+    except Exception as e:
+        print(f"❌ FAIL ({e})")
+        sys.exit(1)
+    print("✅ PASS")
 
-    # 1. Setup
-    run_command([sys.executable, "-m", "pip", "install", "-r",
-                "requirements.txt"], "Setup: Checking Requirements")
 
-    # 2. Synthetic Test
-    run_command([sys.executable, "src/experiment.py"],
+def run_isolated():
+    # Every test in its own Python process (slower, but nothing is shared)
+    run_command([sys.executable, "-m", "src.experiment"],
                 "Test 1: Isometry Verification (Synthetic)")
 
-    # 3. Public Data Test
     # Must explicitly add the project root to PYTHONPATH for this subprocess
     env = os.environ.copy()
     env["PYTHONPATH"] = os.getcwd()
+    run_command([sys.executable, "tools/validate_public.py", "--out", REPORT_PATH],
+                "Test 2: Real-World Validation (MS MARCO)", env=env)
 
-    print("")
-    print("[Test 2: Real-World Validation (MS MARCO)]")
-    try:
-        subprocess.check_call([sys.executable, "tools/validate_public.py",
-                              "--out", "logs/public_report.json"], env=env)
-        print("✅ PASS")
-    except subprocess.CalledProcessError:
-        print("❌ FAIL")
-        sys.exit(1)
+    run_command([sys.executable, "tools/print_report.py", REPORT_PATH],
+                "Summary Report")
+
+
+def run_in_process():
+    # Imported only now: the requirements may have just been installed.
+    # tools/ is not a package, so its scripts are imported by bare name.
+    tools_path = os.path.join(PROJECT_ROOT, "tools")
+    if tools_path not in sys.path:
+        sys.path.insert(0, tools_path)
+
+    from src.experiment import run_experiment
+    from validate_public import run_public_validation
+    from print_report import print_summary
+
+    run_function(run_experiment, "Test 1: Isometry Verification (Synthetic)")
+    run_function(run_public_validation,
+                 "Test 2: Real-World Validation (MS MARCO)", REPORT_PATH)
+    run_function(print_summary, "Summary Report", REPORT_PATH)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--isolated", action="store_true",
+                        help="Run each test in a separate subprocess instead of in this process")
+    args = parser.parse_args()
+
+    print("==========================================")
+    print("   SECURE RAG - REPRODUCIBILITY SUITE")
+    print("==========================================")
+
+    # 1. Setup (always a subprocess, pip must not run inside this interpreter)
+    run_command([sys.executable, "-m", "pip", "install", "-r",
+                "requirements.txt"], "Setup: Checking Requirements")
 
-    # 4. Printing Report
-    run_command([sys.executable, "tools/print_report.py",
-                "logs/public_report.json"], "Summary Report")
+    # 2. Tests
+    if args.isolated:
+        run_isolated()
+    else:
+        run_in_process()
 
     print("")
     print("[Done] Verification Complete.")
@@ -1,4 +1,109 @@
+from functools import lru_cache
+
 import numpy as np
+from numba import njit
+
+
+# Always import this module as 'src.chaos_engine' (run scripts with python -m):
+# Numba's on-disk cache records the module name it was compiled under.
+@njit(cache=True)
+def _logistic_map(r, x0, length):
+    """
+    Compiled core of the logistic map iteration.
+    Kept out of the class so Numba can cache the machine code between runs.
+    No fastmath here: the map is chaotic, so letting LLVM reorder the
+    float ops would silently change every key derived from a seed.
+    """
+
+    out = np.empty(length)
+    x = x0
+    for i in range(length):
+        x = r * x * (1 - x)
+        out[i] = x
+
+    return out
+
+
+@njit(cache=True)
+def logistic_map_parallel(r, x0s, length):
+    """
+    Runs several independent logistic map trajectories side by side.
+    Same arithmetic as ChaosEngine.generate_sequence, so row i is identical
+    to ChaosEngine(r, x0s[i]).generate_sequence(length).
+
+    Args:
+        r (float): The control parameter, shared by all trajectories.
+        x0s (np.ndarray): One initial condition per trajectory.
+        length (int): How many numbers per trajectory.
+
+    Returns:
+        np.ndarray: Shape (len(x0s), length), one trajectory per row.
+    """
+
+    x = x0s.astype(np.float64)
+    out = np.empty((x.shape[0], length))
+    for i in range(length):
+        # All trajectories advance one step per iteration.
+        for t in range(x.shape[0]):
+            x[t] = r * x[t] * (1 - x[t])
+            out[t, i] = x[t]
+
+    return out
+
+
+@lru_cache(maxsize=32)
+def _cached_sequence(r, x0, length):
+    """
+    Memoized logistic map run, keyed by (r, x0, length).
+    Read-only, because every caller gets the very same array.
+    """
+
+    sequence = _logistic_map(r, x0, length)
+    sequence.flags.writeable = False
+    return sequence
+
+
+@lru_cache(maxsize=32)
+def _cached_orthogonal_matrix(r, x0, size):
+    """
+    Memoized key matrix, keyed by (r, x0, size).
+    Read-only, because every caller gets the very same array.
+    """
+
+    # Create a random matrix first using the chaotic sequence.
+    # Flattening it out to fill the grid.
+    # (Straight from the kernel: caching the size*size sequence too would just waste memory.)
+    total_elements = size * size
+    raw_chaos = _logistic_map(r, x0, total_elements)
+
+    # Reshape into a square matrix.
+    # float32 from here on: LAPACK then runs sgeqrf instead of dgeqrf (about half
+    # the work), and the key comes out in float32 like the embeddings, which
+    # halves the memory traffic of every encryption and search.
+    matrix = raw_chaos.reshape((size, size)).astype(np.float32)
+
+    # QR decomposition.
+    # This is the standard linear algebra trick to force orthogonality.
+    # Q will be our orthogonal matrix.
+    Q, R = np.linalg.qr(matrix, mode='reduced')
+
+    # QR is only unique up to the signs of R's diagonal.
+    # Fixing them makes Q a well-defined function of the seed.
+    Q *= np.sign(np.diag(R))
+
+    Q.flags.writeable = False
+    return Q
+
+
+def orthogonality_error(Q):
+    """
+    How far a key is from orthogonal: max |QQ^T - I| and |Q^T Q - I|,
+    computed in the key's own precision (the way encryption uses it).
+    For float32 keys expect a few 1e-7, from float32 rounding alone.
+    """
+
+    identity = np.eye(Q.shape[0], dtype=Q.dtype)
+    return max(np.abs(Q @ Q.T - identity).max(), np.abs(Q.T @ Q - identity).max())
 
 
 class ChaosEngine:
@@ -24,43 +129,21 @@ class ChaosEngine:
             length(int): How many numbers we need. usually matches vector dimension.
 
         Returns:
-            np.array: The chaotic sequence.
+            np.array: The chaotic sequence (read-only, it is shared through a cache).
         """
 
-        # Holds the values.
-        sequence = np.zeros(length)
-
-        # Start with the seed.
-        current_x = self.x0
-
-        # We iterate. Standard logistic map equation.
-        # x_next = r * x * (1 - x)
-        for i in range(length):
-            current_x = self.r * current_x * (1 - current_x)
-            sequence[i] = current_x
-
-        return sequence
+        # Standard logistic map equation, x_next = r * x * (1 - x).
+        # The loop itself runs compiled (see _logistic_map).
+        return _cached_sequence(float(self.r), float(self.x0), int(length))
 
     def generate_orthogonal_matrix(self, size):
         """
         Attempting to create a quasi-orthogonal matrix using the chaos.
         We need this to rotate the embeddings securely.
+        The result is cached per (r, x0, size) and read-only.
         """
 
-        # Create a random matrix first using the chaotic sequence.
-        # Flattening it out to fill the grid.
-        total_elements = size * size
-        raw_chaos = self.generate_sequence(total_elements)
-
-        # Reshape into a square matrix.
-        matrix = raw_chaos.reshape((size, size))
-
-        # QR decomposition.
-        # This is the standard linear algebra trick to force orthogonality.
-        # Q will be our orthogonal matrix. R is discarded.
-        Q, _ = np.linalg.qr(matrix)
-
-        return Q
+        return _cached_orthogonal_matrix(float(self.r), float(self.x0), int(size))
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import numpy as np
-from chaos_engine import ChaosEngine
-from mock_data import MockDataGenerator
+from src.chaos_engine import ChaosEngine, orthogonality_error
+from src.mock_data import MockDataGenerator
 
 
 def calculate_cosine_similarity(vec1, vec2):
@@ -19,11 +19,15 @@ def run_experiment():
 
     # 1. Setup
     DIMENSION = 128
+    SEED = 2024     # Fixed so every run uses the same mock data
     print(f"[Setup] Vector Dimension: {DIMENSION}")
 
+    # One random generator for the whole experiment
+    rng = np.random.default_rng(SEED)
+
     # 2. Generating Data
     print("[Step 1] Generating Mock Data Pairs...")
-    data_gen = MockDataGenerator(dimension=DIMENSION)
+    data_gen = MockDataGenerator(dimension=DIMENSION, rng=rng)
     vec_original_a, vec_original_b = data_gen.create_similar_pair()
 
     sim_original = calculate_cosine_similarity(vec_original_a, vec_original_b)
@@ -37,6 +41,10 @@ def run_experiment():
     key_matrix = chaos_engine.generate_orthogonal_matrix(DIMENSION)
     print(" • Key Matrix Generated using Logistic Map Chaos.")
 
+    # The key is float32, so this sits around a few 1e-7; past 1e-6 something drifted.
+    ortho_error = orthogonality_error(key_matrix)
+    print(f" • Orthogonality Error max|QQ^T - I|: {ortho_error:.2e}")
+
     # 4. Encryption
     # The core operation: Encrypted_Vector = Matrix * Original_Vector
     print("\n[Step 3] Encrypting Vectors (Rotation)...")
@@ -53,11 +61,14 @@ def run_experiment():
     diff = abs(sim_original - sim_encrypted)
     print(f"\n[Result] Difference: {diff:.10f}")
 
-    if diff < 1e-9:
+    # The key is stored in float32, so ~1e-7 rounding is expected.
+    if diff < 1e-5 and ortho_error < 1e-6:
         print("\nSUCCESS: Similarity is preserved perfectly via orthogonal rotation.")
         print("Hypothesis Confirmed: The distances between points remain unchanged in the encrypted space.")
     else:
         print("\nWARNING: Significant deviation present. Check floating point precision or orthogonality.")
+        if ortho_error >= 1e-6:
+            print(f"Key orthogonality error {ortho_error:.2e} exceeds 1e-6.")
 
 
 if __name__ == "__main__":
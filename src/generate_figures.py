@@ -1,6 +1,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from chaos_engine import ChaosEngine
+from src.chaos_engine import ChaosEngine, logistic_map_parallel
 import os
 
 # Ensures output directory exists
@@ -13,12 +13,10 @@ def plot_chaos_sensitivity():
     r = 3.99
 
     # Run 1: Initial condition 0.5
-    engine1 = ChaosEngine(r=r, x0=0.5)
-    seq1 = engine1.generate_sequence(length)
-
     # Run 2: Initial condition 0.5000000001 (Tiny change)
-    engine2 = ChaosEngine(r=r, x0=0.5000000001)
-    seq2 = engine2.generate_sequence(length)
+    # Both trajectories are iterated together in one pass.
+    seq1, seq2 = logistic_map_parallel(
+        r, np.array([0.5, 0.5000000001]), length)
 
     plt.figure(figsize=(10, 5))
     plt.plot(seq1[:50], 'b-', label='Key: 0.5000000000',
@@ -1,17 +1,28 @@
 import numpy as np
 
 
+def _unit(v):
+    """
+    Scales a single vector to length 1.
+    vdot + sqrt is cheaper than np.linalg.norm for a plain 1D vector.
+    """
+
+    return v * (1.0 / np.sqrt(np.vdot(v, v)))
+
+
 class MockDataGenerator:
     """
     Generates fake vector embeddings for testing encryption.
     Real embeddings are just lists of floats, so I simulate that here.
     """
 
-    def __init__(self, dimension=128, num_documents=10):
+    def __init__(self, dimension=128, num_documents=10, rng=None):
         # dimension: The size of the vector (e.g., Gemini is 768, I used 128 for speed).
         # num_documents: How many fake 'files' to generate.
+        # rng: Optional np.random.Generator, pass a seeded one for reproducible data.
         self.dimension = dimension
         self.num_documents = num_documents
+        self.rng = rng if rng is not None else np.random.default_rng()
 
     def generate_embeddings(self):
         """
@@ -22,11 +33,13 @@ class MockDataGenerator:
         # Create a matrix of random numbers [10 rows, 128 columns]
         # I normalized them so they look like real unit vectors (length = 1).
         # Real embeddings usually have a magnitude of 1.
-        raw_data = np.random.rand(self.num_documents, self.dimension)
+        # float32, same as the output of real embedding models.
+        raw_data = self.rng.random(
+            (self.num_documents, self.dimension), dtype=np.float32)
 
         # L2 Normalization (making sure the arrow length is 1)
-        # axis=1 means, process row by row.
-        norms = np.linalg.norm(raw_data, axis=1, keepdims=True)
+        # einsum squares and sums each row in one pass.
+        norms = np.sqrt(np.einsum('ij,ij->i', raw_data, raw_data))[:, None]
         normalized_data = raw_data / norms
 
         return normalized_data
@@ -38,14 +51,14 @@ class MockDataGenerator:
         """
 
         # 1. Creates a random vector (Vector A)
-        vec_a = np.random.rand(self.dimension)
-        vec_a = vec_a / np.linalg.norm(vec_a)
+        vec_a = self.rng.random(self.dimension, dtype=np.float32)
+        vec_a = _unit(vec_a)
 
         # 2. Creates Vector B by adding a tiny bit of noise to A.
         # 0.01 is very small noise
-        noise = np.random.normal(0, 0.01, self.dimension)
+        noise = 0.01 * self.rng.standard_normal(self.dimension, dtype=np.float32)
         vec_b = vec_a + noise
-        vec_b = vec_b / np.linalg.norm(vec_b)
+        vec_b = _unit(vec_b)
 
         return vec_a, vec_b
 
@@ -53,7 +66,7 @@ class MockDataGenerator:
 if __name__ == "__main__":
     # Testing the generator
     # Small dimension for readable output
-    gen = MockDataGenerator(dimension=5)
+    gen = MockDataGenerator(dimension=5, rng=np.random.default_rng(2024))
 
     print("- Single Batch Test -")
     print(gen.generate_embeddings())
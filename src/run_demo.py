@@ -10,6 +10,7 @@ def run_demo():
     DIMENSION = 128
     DB_SIZE = 100
     SECRET_KEY = 0.459382   # Example User Key
+    SEED = 2024             # Fixed so every run uses the same mock data
 
     # 2. Initializing the Secure Engine
     secure_rag = SecureVectorEngine(SECRET_KEY, DIMENSION)
@@ -17,9 +18,10 @@ def run_demo():
     # 3. Generating Mock Data (Unencrypted)
     print("\n[Data] Generating mock vectors...")
     # Initializing the generator
-    # Note: DB_SIZE - 1 because we will add one target manually
+    # (one seeded random generator for all the mock data)
+    rng = np.random.default_rng(SEED)
     generator = MockDataGenerator(
-        dimension=DIMENSION, num_documents=DB_SIZE - 1)
+        dimension=DIMENSION, num_documents=DB_SIZE, rng=rng)
 
     # Generating the database background noise
     database = generator.generate_embeddings()
@@ -27,27 +29,26 @@ def run_demo():
     # Generating a specific Query and Target pair
     query_vector, target_vector = generator.create_similar_pair()
 
-    # Inserting target into database at specific index
+    # Placing target into database at specific index
+    # (overwriting that row in place, no reallocation)
     target_index = 42
-    database = np.insert(database, target_index, target_vector, axis=0)
+    database[target_index] = target_vector
 
     print(f"[Data] Database size: {database.shape}")
     print(f"[Data] Target placed at index: {target_index}")
 
-    # 4. ENCRYPTION
-    print("\n[Encryption] Encrypting Database and Query...")
-    encrypted_db = secure_rag.encrypt_batch(database)
-    encrypted_query = secure_rag.encrypt_single(query_vector)
+    # 4. ENCRYPTION (done once for the whole database)
+    print("\n[Encryption] Indexing (encrypting) Database...")
+    encrypted_db = secure_rag.index(database)
 
-    # 5. BLIND SEARCH
-    print("[Search] Performing search on encrypted data...")
-    indices, distances = secure_rag.search(
-        encrypted_query, encrypted_db, top_k=3)
+    # 5. BLIND SEARCH (the query is encrypted on the way in)
+    print("[Search] Encrypting Query and searching encrypted data...")
+    indices, scores = secure_rag.query(query_vector, encrypted_db, k=3)
 
     # 6. VERIFICATION
     print("\n=== Results ===")
     print(f"Top 3 Indices found: {indices}")
-    print(f"Distances (smaller is better): {distances}")
+    print(f"Scores (higher is better): {scores}")
 
     if indices[0] == target_index:
         print("\n✅ SUCCESS: The system found the hidden target!")
@@ -1,6 +1,6 @@
 import numpy as np
-from chaos_engine import ChaosEngine
-from mock_data import MockDataGenerator
+from src.chaos_engine import ChaosEngine
+from src.mock_data import MockDataGenerator
 
 
 def calculate_cosine_similarity(vec1, vec2):
@@ -15,12 +15,15 @@ def run_search_simulation():
     # 1. Setup
     DIMENSION = 128
     NUM_DOCS = 100
+    SEED = 2024     # Fixed so every run uses the same mock data
     print(f"[Setup] Database Size: {NUM_DOCS} documents")
     print(f"[Setup] Vector Dimension: {DIMENSION}")
 
     # 2. Preparing Data (Plaintext)
     print("\n[Step 1] Creating Plaintext Database...")
-    gen = MockDataGenerator(dimension=DIMENSION, num_documents=NUM_DOCS)
+    # One random generator for the database and the query noise
+    rng = np.random.default_rng(SEED)
+    gen = MockDataGenerator(dimension=DIMENSION, num_documents=NUM_DOCS, rng=rng)
     database_plaintext = gen.generate_embeddings()
 
     # Selecting a "Target" document (in this case, index 42) to search for
@@ -29,7 +32,7 @@ def run_search_simulation():
 
     # Creates a Query that is similar to the Target (simulating a user search)
     # Adding noise to the target to make the query
-    noise = np.random.normal(0, 0.05, DIMENSION)
+    noise = rng.standard_normal(DIMENSION, dtype=np.float32) * 0.05
     query_plaintext = target_vector + noise
 
     # Normalize
@@ -58,14 +61,12 @@ def run_search_simulation():
     print("\n[Step 4] Searching Encrypted Database...")
 
     # Calculated similarity between Encrypted Query and ALL Encrypted Docs
-    similarities = []
-    for idx, doc_vector in enumerate(database_encrypted):
-        sim = calculate_cosine_similarity(query_encrypted, doc_vector)
-        similarities.append(sim)
+    # (one matrix-vector product instead of a dot product per document)
+    similarities = database_encrypted @ query_encrypted
 
     # Finds the index of the highest similarity
-    best_match_index = np.argmax(similarities)
-    best_match_score = similarities[best_match_index]
+    best_match_index = int(np.argmax(similarities))
+    best_match_score = float(similarities[best_match_index])
 
     # 6. The Results
     print(f"\n[Result] Best Match Found At Index: {best_match_index}")
@@ -1,33 +1,186 @@
+import hashlib
+import os
+
 import numpy as np
 from src.chaos_engine import ChaosEngine
 
+# Where generated key matrices are kept between runs.
+KEY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "secure_rag")
+
+# Bump this whenever ChaosEngine changes how it builds the matrix,
+# so stale keys on disk are never picked up.
+KEY_CACHE_VERSION = 4
+
+
+def _load_key(path: str, dimension: int) -> np.ndarray:
+    """
+    Memory-maps a key file read-only, checking it is a (dimension, dimension) matrix.
+    """
+
+    key = np.load(path, mmap_mode='r')
+    if key.shape != (dimension, dimension):
+        raise ValueError(
+            f"Key file {path} has shape {key.shape}, expected ({dimension}, {dimension}).")
+    return key
+
+
+def _is_private(path: str) -> bool:
+    """
+    True if path belongs to the current user (always True where there are no uids).
+    """
+
+    return not hasattr(os, "getuid") or os.stat(path).st_uid == os.getuid()
+
+
+def _make_private_dir(directory: str) -> bool:
+    """
+    Creates the folder, or tightens an existing one, so only the current user can use it.
+    Returns False if it belongs to someone else.
+    """
+
+    # mode only applies when the folder is new, so an existing one is checked too
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not _is_private(directory):
+        return False
+    if os.stat(directory).st_mode & 0o077:
+        os.chmod(directory, 0o700)
+    return True
+
 
 class SecureVectorEngine:
     """
     A high-level API for Secure RAG operations.
     Encapsulates key management, encryption, and search logic.
+
+    Stored vectors are assumed unit-length (embeddings are normalized and the
+    key is a rotation). search() relies on this to rank by inner product.
     """
 
-    def __init__(self, secret_key: float, dimension: int):
+    def __init__(self, secret_key: float, dimension: int, use_cache: bool = True,
+                 key_path: str = None):
         """
         Initialize the engine with a secret key and vector dimension.
 
         Args:
             secret_key (float): The initial condition for the chaotic map (0 < key < 1).
+                May be None when key_path is given.
             dimension (int): The size of the embedding vectors (e.g., 128, 768).
+            use_cache (bool): Keep the key matrix on disk between runs (in KEY_CACHE_DIR).
+                Pass False to never write the key to disk.
+            key_path (str): Use the key matrix saved in this .npy file instead of
+                generating one (memory-mapped read-only).
             """
 
+        if secret_key is None and key_path is None:
+            raise ValueError("Either secret_key or key_path is required.")
+
         self.secret_key = secret_key
         self.dimension = dimension
 
         # Initializing the chaotic crypto-processor
-        self.engine = ChaosEngine(r=3.99, x0=self.secret_key)
+        # (None when the engine only has a saved key: the seed can't be recovered from it)
+        self.engine = ChaosEngine(
+            r=3.99, x0=self.secret_key) if secret_key is not None else None
+
+        if key_path is not None:
+            # A saved key, float32 like every generated key (no copy when the file already is).
+            self.key_path = key_path
+            self.orthogonal_key = _load_key(
+                key_path, dimension).astype(np.float32, copy=False)
+            print(f"[SecureEngine] Loaded Orthogonal Key for dim={dimension} from {key_path}.")
+        else:
+            # Pre-computing the orthogonal key matrix (This acts as the "Session Key")
+            # The key only depends on (seed, dim, r), so it is cached on disk.
+            # Note: the cache file IS the key, so the folder is kept private.
+            # (key_path can be handed to from_key_file() in other processes.)
+            self.key_path = self._key_cache_path() if use_cache else None
+            self.orthogonal_key = self._cached_or_new_key()
+
+    def _cached_or_new_key(self) -> np.ndarray:
+        """
+        The key from the cache if there is one, otherwise a freshly generated (and cached) key.
+        """
+
+        cached_key = self._load_cached_key() if self.key_path else None
+        if cached_key is not None:
+            print(f"[SecureEngine] Loaded cached Orthogonal Key for dim={self.dimension}.")
+            return cached_key
 
-        # Pre-computing the orthogonal key matrix (This acts as the "Session Key")
         print(
-            f"[SecureEngine] Generating Orthogonal Key for dim={dimension}...")
-        self.orthogonal_key = self.engine.generate_orthogonal_matrix(dimension)
+            f"[SecureEngine] Generating Orthogonal Key for dim={self.dimension}...")
+        key = self.engine.generate_orthogonal_matrix(self.dimension)
+        if self.key_path:
+            self._save_key(self.key_path, key)
         print("[SecureEngine] Key Generation Complete.")
+        return key
+
+    @classmethod
+    def from_key_file(cls, path: str, dimension: int) -> "SecureVectorEngine":
+        """
+        Builds an engine around an existing key file (e.g. an engine's key_path),
+        without generating anything. The key is memory-mapped read-only.
+
+        Args:
+            path (str): A .npy file holding the orthogonal key matrix.
+            dimension (int): The size of the embedding vectors.
+
+        Returns:
+            SecureVectorEngine: Ready to encrypt and search.
+        """
+
+        return cls(None, dimension, key_path=path)
+
+    def _key_cache_path(self) -> str:
+        """
+        Path of the cached key file for this (secret_key, dimension, r).
+        """
+
+        tag = f"{self.secret_key}:{self.dimension}:{self.engine.r}:v{KEY_CACHE_VERSION}"
+        digest = hashlib.blake2b(tag.encode(), digest_size=16).hexdigest()
+        return os.path.join(KEY_CACHE_DIR, f"key_{digest}.npy")
+
+    def _load_cached_key(self):
+        """
+        Loads this engine's key from the cache, or returns None on a miss.
+        Anything unexpected (someone else's file, wrong shape or dtype) counts as a miss.
+        """
+
+        try:
+            if not _make_private_dir(os.path.dirname(self.key_path)):
+                return None
+            if not os.path.exists(self.key_path) or not _is_private(self.key_path):
+                return None
+            key = _load_key(self.key_path, self.dimension)
+        except (OSError, ValueError):
+            return None
+
+        return key if key.dtype == np.float32 else None
+
+    def _save_key(self, cache_path: str, key: np.ndarray):
+        """
+        Writes the key to the cache. A failed write only costs a regeneration next time.
+        """
+
+        # The file is the key itself, so folder and file are private to the user.
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            if not _make_private_dir(os.path.dirname(cache_path)):
+                print("[SecureEngine] Key cache folder belongs to another user, not caching key.")
+                return
+            # Writing to a temp file first so a concurrent reader never sees half a key.
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except OSError as e:
+            print(f"[SecureEngine] Could not cache key ({e}).")
+            return
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, key)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            # Not leaving a half-written temp file behind.
+            os.remove(tmp_path)
+            print(f"[SecureEngine] Could not cache key ({e}).")
 
     def encrypt_batch(self, vectors: np.ndarray) -> np.ndarray:
         """
@@ -41,8 +194,9 @@ class SecureVectorEngine:
         """
 
         # Linear Algebra: Encrypted = Vectors @ Key
-        # (Using dot product for rotation)
-        return vectors @ self.orthogonal_key
+        # (Using dot product for rotation, in float32 like the key)
+        # One big product: BLAS already spreads a large sgemm over all cores.
+        return vectors.astype(np.float32, copy=False) @ self.orthogonal_key
 
     def encrypt_single(self, vector: np.ndarray) -> np.ndarray:
         """
@@ -52,20 +206,19 @@ class SecureVectorEngine:
             vector (np.ndarray): Shape (dimension,) or (1, dimension)
 
         Returns:
-            np.ndarray: Encrypted vector
+            np.ndarray: Encrypted vector, same shape as the input
         """
 
-        # Ensuring it's 2D for matrix multiplication
-        if vector.ndim == 1:
-            vector = vector.reshape(1, -1)
-
-        encrypted = vector @ self.orthogonal_key
-        return encrypted.flatten()
+        # 1D @ 2D is a plain matrix-vector product, no reshaping needed
+        return vector.astype(np.float32, copy=False) @ self.orthogonal_key
 
     def search(self, encrypted_query: np.ndarray, encrypted_database: np.ndarray, top_k: int = 5):
         """
         Performs a 'Blind Search' on encrypted data.
-        Calculates distances without ever decrypting.
+        Scores documents without ever decrypting.
+
+        Embeddings are unit-length and the key is a rotation, so ranking by
+        inner product gives the same order as ranking by Euclidean distance.
 
         Args:
             encrypted_query (np.ndarray): The encrypted user query.
@@ -74,24 +227,52 @@ class SecureVectorEngine:
 
         Returns:
             indices (np.ndarray): Indices of the nearest neighbors.
-            distances (np.ndarray): The distances to those neighbors.
+            scores (np.ndarray): Similarity scores of those neighbors (higher is closer).
         """
 
-        # Ensuring query is 2D
-        if encrypted_query.ndim == 1:
-            encrypted_query = encrypted_query.reshape(1, -1)
+        # Ensuring query is 1D (a view, no copy)
+        encrypted_query = np.ravel(encrypted_query)
 
-        # 1. Computing Euclidean Distances (Vectorized)
-        # dist = sqrt(sum((db - query)^2))
-        diff = encrypted_database - encrypted_query
-        sq_dist = np.sum(diff ** 2, axis=1)
-        distances = np.sqrt(sq_dist)
+        # 1. Computing similarity to every document (one matrix-vector product)
+        scores = encrypted_database @ encrypted_query
 
-        # 2. Sorting and getting Top-K indices
-        # argsort gives indices of elements from smallest to largest
-        sorted_indices = np.argsort(distances)
+        # 2. Picking the Top-K without sorting the whole database (O(N)),
+        # then ordering just those from best to worst.
+        # argpartition needs top_k < N; asking for everything is a plain sort.
+        if top_k < len(scores):
+            top_indices = np.argpartition(-scores, top_k)[:top_k]
+            top_indices = top_indices[np.argsort(-scores[top_indices])]
+        else:
+            top_indices = np.argsort(-scores)
+        top_scores = scores[top_indices]
 
-        top_indices = sorted_indices[:top_k]
-        top_distances = distances[top_indices]
+        return top_indices, top_scores
+
+    def index(self, database: np.ndarray) -> np.ndarray:
+        """
+        Encrypts a knowledge base once, ready to be queried many times.
+
+        Args:
+            database (np.ndarray): Unit-length vectors, shape (N, dimension)
+
+        Returns:
+            np.ndarray: Encrypted float32 database of shape (N, dimension)
+        """
+
+        return self.encrypt_batch(database)
+
+    def query(self, query: np.ndarray, encrypted_database: np.ndarray, k: int = 5):
+        """
+        Encrypts a plaintext query and searches an indexed database with it.
+
+        Args:
+            query (np.ndarray): The plaintext (unit-length) user query.
+            encrypted_database (np.ndarray): Output of index().
+            k (int): Number of results to return.
+
+        Returns:
+            indices (np.ndarray): Indices of the nearest neighbors.
+            scores (np.ndarray): Similarity scores of those neighbors (higher is closer).
+        """
 
-        return top_indices, top_distances
+        return self.search(self.encrypt_single(query), encrypted_database, top_k=k)